@@ -12,8 +12,15 @@ bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
 # ── Workers ───────────────────────────────────────────────────────────────
 # 2-4 × CPU cores is recommended. Cap at 4 for small instances.
 workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 4)))
-worker_class = "gthread"
-threads = 2
+# gthread by default; deployments that install gevent can switch via env
+# (WORKER_CLASS=gevent) to multiplex keep-alive connections on one thread.
+worker_class = os.environ.get("WORKER_CLASS", "gthread")
+threads = int(os.environ.get("WORKER_THREADS", "2"))
+worker_connections = int(os.environ.get("WORKER_CONNECTIONS", "1000"))
+
+# Import the app once in the master so the route map, compiled templates
+# and module constants are shared copy-on-write across forked workers.
+preload_app = True
 
 # ── Timeouts ──────────────────────────────────────────────────────────────
 timeout = 120
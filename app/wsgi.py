@@ -7,5 +7,8 @@ Usage:
 
 from app import app, init_db
 
-# Ensure database tables exist on first deploy
-init_db()
+# Ensure database tables exist on first deploy; the guard keeps preloaded
+# workers from re-running the DDL after fork
+if not app.config.get("_DB_INIT"):
+    init_db()
+    app.config["_DB_INIT"] = True